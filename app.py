@@ -1,35 +1,48 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
+from plotly_resampler import FigureResampler
 import seaborn as sns
 from wordcloud import WordCloud
 import re
-import jieba
+import io
+import pickle
+from fugashi import Tagger
 import emoji
 from collections import Counter
+from itertools import chain
 import networkx as nx
 from datetime import datetime
 import numpy as np
-from textblob import TextBlob
+from pathlib import Path
 import warnings
 warnings.filterwarnings('ignore')
 
 # フォント設定のインポート
 from fonts import get_japanese_font_path, get_font_family
 
-# Matplotlibのフォント設定
-font_path = get_japanese_font_path()
-if font_path:
-    # フォントファイルをMatplotlibに登録
-    font_prop = fm.FontProperties(fname=font_path)
-    plt.rcParams['font.family'] = font_prop.get_name()
-    # フォールバックフォントの設定
-    plt.rcParams['font.sans-serif'] = ['Noto Sans JP', 'DejaVu Sans', 'sans-serif']
-    plt.rcParams['axes.unicode_minus'] = False
+# 前処理用の正規表現（起動時に一度だけコンパイル）
+# 空白以外のASCII文字が続く限りURLとみなす。ただし直後に続くハッシュタグを巻き込まないよう#は除く
+URL_RE = re.compile(r'https?://[!"$-~]+')
+MENTION_RE = re.compile(r'@\w+')
+NONWORD_RE = re.compile(r'[^\w\s#]')
+WS_RE = re.compile(r'\s+')
+HASHTAG_RE = re.compile(r'#\w+')
+
+# ワードクラウド・単語マップから除く品詞（UniDicの品詞大分類）
+EXCLUDED_POS = {'助詞', '助動詞', '補助記号', '記号', '空白', '接尾辞', '連体詞'}
+# UniDicでは普通名詞になる形式名詞
+EXCLUDED_WORDS = {'こと', 'もの', 'ため', 'よう', 'とき', 'ところ'}
+# 基本形が表層形と異なりうる（活用する）品詞
+CONJUGATING_POS = {'動詞', '形容詞'}
+
+# ワードクラウド・単語マップで集計する投稿数の上限（超えた分はサンプリング）
+SAMPLE_CAP = 20_000
+
+# 時系列の折れ線グラフでブラウザに送る点数の上限
+# （Streamlitでは描画時に一度だけ間引くので、拡大しても細部は再取得されない）
+TIMESERIES_MAX_POINTS = 2000
 
 # ページ設定
 st.set_page_config(
@@ -65,117 +78,238 @@ search_hashtag = st.sidebar.text_input(
 )
 
 # データ読み込みと前処理
+# キャッシュがファイル内容で効くように、UploadedFileではなくバイト列を受け取る
 @st.cache_data(ttl=3600, max_entries=10)
-def load_and_process_data(file):
+def load_and_process_data(file_bytes, filename):
     """CSVファイルを読み込んで前処理を行う"""
     try:
-        df = pd.read_csv(file)
-        
-        # 列名の正規化
-        df.columns = df.columns.str.strip()
-        
-        # 投稿日時の処理
-        if '投稿日時' in df.columns:
-            df['投稿日時'] = pd.to_datetime(df['投稿日時'], format='%Y/%m/%d %H:%M', errors='coerce')
-        elif 'created_at' in df.columns:
-            df['投稿日時'] = pd.to_datetime(df['created_at'], errors='coerce')
+        # 列名だけ先に読み込み、分析に使う列を決める
+        header = pd.read_csv(io.BytesIO(file_bytes), nrows=0).columns
+        # 列名の正規化（正規化後の列名 -> 元の列名）
+        raw_columns = {col.strip(): col for col in header}
         
         # テキスト列の確認
         text_column = None
         for col in ['テキスト', 'text', 'content', 'tweet_text']:
-            if col in df.columns:
+            if col in raw_columns:
                 text_column = col
                 break
         
         if text_column is None:
             st.error("テキスト列が見つかりません。CSVファイルに'テキスト'列があることを確認してください。")
-            return None
+            return None, None, None
+        
+        # 投稿日時列の確認
+        date_column = None
+        for col in ['投稿日時', 'created_at']:
+            if col in raw_columns:
+                date_column = col
+                break
+        
+        # 必要な列だけをpyarrowで読み込む
+        usecols = [raw_columns[col] for col in [date_column, text_column] if col is not None]
+        df = pd.read_csv(
+            io.BytesIO(file_bytes),
+            engine='pyarrow',
+            usecols=usecols,
+            dtype={raw_columns[text_column]: 'string[pyarrow]'}
+        )
+        df.columns = df.columns.str.strip()
+        
+        # 投稿日時の処理
+        if date_column == '投稿日時':
+            df['投稿日時'] = pd.to_datetime(df['投稿日時'], format='%Y/%m/%d %H:%M', errors='coerce')
+        elif date_column == 'created_at':
+            df['投稿日時'] = pd.to_datetime(df['created_at'], errors='coerce')
         
         # テキストの前処理
-        df['テキスト_処理済み'] = df[text_column].astype(str).apply(preprocess_text)
+        # 欠損を空文字にした文字列列を一度だけ作り、以降の処理で共用する
+        # （読み込み時にstring[pyarrow]としているため型変換は実質行われない）
+        text_series = df[text_column].fillna('').astype('string[pyarrow]')
+        
+        df['テキスト_処理済み'] = preprocess_series(text_series)
         
         # ハッシュタグの抽出
-        df['ハッシュタグ'] = df[text_column].astype(str).apply(extract_hashtags)
+        df['ハッシュタグ'] = text_series.str.findall(HASHTAG_RE)
+        # 検索用の索引（小文字化したハッシュタグ -> 投稿のインデックス）
+        lower_tags = text_series.str.lower().str.findall(HASHTAG_RE).explode().dropna()
+        hashtag_index = lower_tags.groupby(lower_tags).groups
+        
+        # 形態素解析は1回だけ行い、内容語の表層形と全単語の基本形を取り出す
+        tagger = get_tagger()
+        parsed = df['テキスト_処理済み'].map(lambda t: tokenize(tagger, t))
+        
+        # 分かち書き（内容語の表層形）。ワードクラウド・単語マップで共用する
+        df['トークン'] = parsed.str[0]
         
-        # 感情分析
-        df['感情スコア'] = df[text_column].astype(str).apply(analyze_sentiment)
+        # 感情分析（活用形でも一致するよう、全単語の基本形を感情辞書で引く）
+        df['感情スコア'] = score_sentiment(parsed.str[1], load_sentiment_lexicon())
         
-        return df, text_column
+        return df, text_column, hashtag_index
         
     except Exception as e:
         st.error(f"ファイルの読み込みエラー: {str(e)}")
-        return None, None
+        return None, None, None
 
-def preprocess_text(text):
-    """テキストの前処理"""
-    if pd.isna(text):
-        return ""
-    
-    # URLの除去
-    text = re.sub(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', '', str(text))
-    
-    # メンションの除去
-    text = re.sub(r'@\w+', '', text)
+def preprocess_series(s):
+    """テキスト列の前処理（列単位でまとめて処理、欠損は空文字にしておくこと）"""
+    s = (
+        s.str.replace(URL_RE, '', regex=True)          # URLの除去
+         .str.replace(MENTION_RE, '', regex=True)      # メンションの除去
+    )
+    # 絵文字の除去（全絵文字の正規表現より、emojiライブラリの方が速い）
+    s = s.map(lambda t: emoji.replace_emoji(t, replace=''))
+    return (
+        s.str.replace(NONWORD_RE, ' ', regex=True)     # 特殊文字の除去
+         .str.replace(WS_RE, ' ', regex=True)          # 複数の空白を単一の空白に
+         .str.strip()
+    )
+
+@st.cache_resource
+def get_tagger():
+    """MeCab（fugashi）の形態素解析器を取得（セッション間で共有）"""
+    return Tagger()
+
+def tokenize(tagger, text):
+    """形態素解析して（内容語の表層形のリスト, 全単語の基本形のリスト）を返す
+
+    内容語は助詞・助動詞・記号・接尾辞・連体詞と非自立語、形式名詞、1文字の単語を除いたもの。
+    w.featureは単語ごとにnamedtupleを作って遅いため、feature_rawを必要な分だけ分割する
+    """
+    surfaces = []
+    base_forms = []
+    for word in tagger(text):
+        surface = word.surface
+        pos1, pos2, _ = word.feature_raw.split(',', 2)
+        
+        if pos1 in CONJUGATING_POS:
+            # 基本形（orthBase）は11番目の項目。未知語は項目が少ないので表層形を使う
+            fields = word.feature_raw.split(',', 11)
+            base_forms.append(fields[10] if len(fields) > 10 and fields[10] != '*' else surface)
+        else:
+            base_forms.append(surface)
+        
+        if (pos1 not in EXCLUDED_POS and pos2 != '非自立可能'
+                and surface not in EXCLUDED_WORDS and len(surface) > 1):
+            surfaces.append(surface)
+    return surfaces, base_forms
+
+@st.cache_data
+def load_sentiment_lexicon():
+    """感情辞書（単語 -> スコア）を読み込む"""
+    lexicon_path = Path(__file__).parent / "sentiment_lexicon.csv"
+    lexicon = pd.read_csv(lexicon_path)
+    return lexicon.set_index('単語')['スコア']
+
+def score_sentiment(tokens, lexicon):
+    """感情分析（辞書ベース・簡易版）
+
+    投稿ごとに辞書に含まれる単語のスコアを平均し、該当語がなければ0とする
+    """
+    scores = tokens.explode().map(lexicon)
+    return scores.groupby(level=0).mean().reindex(tokens.index).fillna(0.0)
+
+# トークン列はリストを含みpandasのハッシュが使えないため、pickleしたバイト列をキャッシュキーにする
+TOKENS_HASH_FUNCS = {pd.Series: pickle.dumps}
+
+@st.cache_data(max_entries=20, hash_funcs=TOKENS_HASH_FUNCS)
+def count_words(tokens):
+    """分かち書き済みの単語の出現回数を数える"""
+    return Counter(chain.from_iterable(tokens))
+
+@st.cache_data(max_entries=20, hash_funcs=TOKENS_HASH_FUNCS)
+def count_cooccurrences(tokens, top_n=20):
+    """隣接する単語（1つ先・2つ先）の共起回数を数え、上位top_n件を返す
+
+    単語を整数IDに変換し、ペアをint64に詰めてNumPyでまとめて集計する。
+    同数のペアは初めて現れた順に並べる（Counter.most_commonと同じ順序）
+    """
+    exploded = tokens.explode().dropna()
+    if exploded.empty:
+        return []
     
-    # 絵文字の除去
-    text = emoji.replace_emoji(text, replace='')
+    ids, vocab = pd.factorize(exploded)
+    rows = pd.factorize(exploded.index)[0]
     
-    # 特殊文字の除去
-    text = re.sub(r'[^\w\s#]', ' ', text)
+    keys = []
+    order = []
+    positions = np.arange(len(ids))
+    for offset in (1, 2):
+        # 同じ投稿内のペアのみ
+        same_post = rows[:-offset] == rows[offset:]
+        pairs = np.sort(np.stack([ids[:-offset][same_post], ids[offset:][same_post]], axis=1), axis=1)
+        keys.append((pairs[:, 0].astype(np.int64) << 32) | pairs[:, 1])
+        # 単語の位置ごとに1つ先→2つ先の順で数えたときの出現順
+        order.append(positions[:-offset][same_post] * 2 + (offset - 1))
+    keys = np.concatenate(keys)
+    order = np.concatenate(order)
+    if keys.size == 0:
+        return []
     
-    # 複数の空白を単一の空白に
-    text = re.sub(r'\s+', ' ', text).strip()
+    unique_keys, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+    first_seen = np.full(len(unique_keys), np.iinfo(np.int64).max)
+    np.minimum.at(first_seen, inverse, order)
+    # 共起回数の降順、同数なら初出順
+    top = np.lexsort((first_seen, -counts))[:top_n]
     
-    return text
+    top_pairs = []
+    for key, count in zip(unique_keys[top], counts[top]):
+        word1, word2 = sorted((vocab[key >> 32], vocab[key & 0xFFFFFFFF]))
+        top_pairs.append(((word1, word2), int(count)))
+    return top_pairs
 
-def extract_hashtags(text):
-    """ハッシュタグを抽出"""
-    if pd.isna(text):
-        return []
-    hashtags = re.findall(r'#\w+', str(text))
-    return hashtags
+@st.cache_data(max_entries=20)
+def build_wordcloud(frequencies, font_path):
+    """単語頻度からワードクラウド画像を生成"""
+    wordcloud = WordCloud(
+        width=800,
+        height=400,
+        background_color='white',
+        max_words=100,
+        colormap='viridis',
+        collocations=False,
+        font_path=font_path if font_path else None
+    ).generate_from_frequencies(frequencies)
+    return np.asarray(wordcloud.to_image())
 
-def analyze_sentiment(text):
-    """感情分析（簡易版）"""
-    if pd.isna(text) or text == "":
-        return 0
-    
-    try:
-        blob = TextBlob(text)
-        return blob.sentiment.polarity
-    except:
-        return 0
+def filter_by_hashtag(df, hashtag, hashtag_index):
+    """特定のハッシュタグでフィルタリング
 
-def filter_by_hashtag(df, hashtag):
-    """特定のハッシュタグでフィルタリング"""
+    投稿全体ではなく、ハッシュタグ索引のユニークなタグだけを部分一致で調べる
+    """
     if not hashtag or hashtag == "":
         return df
     
-    hashtag = hashtag.lower()
-    filtered_df = df[df['テキスト_処理済み'].str.contains(hashtag, case=False, na=False)]
+    hashtag = hashtag.lower().lstrip('#')
+    matched_rows = [rows.to_numpy() for tag, rows in hashtag_index.items() if hashtag in tag]
     
-    if len(filtered_df) == 0:
-        # ハッシュタグ列で検索
-        filtered_df = df[df['ハッシュタグ'].apply(lambda x: any(hashtag in tag.lower() for tag in x))]
+    if not matched_rows:
+        return df.iloc[0:0]
     
-    return filtered_df
+    return df[df.index.isin(np.concatenate(matched_rows))]
 
 # メイン処理
 if uploaded_file is not None:
-    df, text_column = load_and_process_data(uploaded_file)
+    df, text_column, hashtag_index = load_and_process_data(uploaded_file.getvalue(), uploaded_file.name)
     
     if df is not None:
         st.success(f"✅ データの読み込みが完了しました！ ({len(df)}件の投稿)")
         
         # ハッシュタグでフィルタリング
         if search_hashtag:
-            df_filtered = filter_by_hashtag(df, search_hashtag)
+            df_filtered = filter_by_hashtag(df, search_hashtag, hashtag_index)
             st.info(f"🔍 '{search_hashtag}' に関する投稿: {len(df_filtered)}件")
         else:
             df_filtered = df
             st.info("🔍 全投稿を分析対象としています")
         
         if len(df_filtered) > 0:
+            # ワードクラウド・単語マップ用のサンプル（上位の単語は数万件で安定するため）
+            if len(df_filtered) > SAMPLE_CAP:
+                corpus_sample = df_filtered.sample(n=SAMPLE_CAP, random_state=0)
+            else:
+                corpus_sample = df_filtered
+            
             # タブを作成
             tab1, tab2, tab3, tab4, tab5 = st.tabs([
                 "📈 基本統計", 
@@ -198,7 +332,7 @@ if uploaded_file is not None:
                     st.metric("平均文字数", f"{avg_length:.1f}")
                 
                 with col3:
-                    total_hashtags = sum(len(hashtags) for hashtags in df_filtered['ハッシュタグ'])
+                    total_hashtags = int(df_filtered['ハッシュタグ'].str.len().sum())
                     st.metric("総ハッシュタグ数", total_hashtags)
                 
                 with col4:
@@ -219,21 +353,15 @@ if uploaded_file is not None:
                 
                 with col1:
                     st.subheader("📊 ハッシュタグランキング")
-                    all_hashtags = []
-                    for hashtags in df_filtered['ハッシュタグ']:
-                        all_hashtags.extend(hashtags)
+                    top_hashtags = df_filtered['ハッシュタグ'].explode().dropna().value_counts().head(10)
                     
-                    hashtag_counts = Counter(all_hashtags)
-                    top_hashtags = dict(hashtag_counts.most_common(10))
-                    
-                    if top_hashtags:
-                        fig = px.bar(
-                            x=list(top_hashtags.values()),
-                            y=list(top_hashtags.keys()),
-                            orientation='h',
-                            title="ハッシュタグ使用頻度トップ10"
-                        )
-                        fig.update_layout(height=400)
+                    if not top_hashtags.empty:
+                        fig = go.Figure(go.Bar(
+                            x=top_hashtags.values,
+                            y=top_hashtags.index,
+                            orientation='h'
+                        ))
+                        fig.update_layout(title="ハッシュタグ使用頻度トップ10", height=400)
                         st.plotly_chart(fig, use_container_width=True)
                     else:
                         st.info("ハッシュタグが見つかりませんでした")
@@ -243,13 +371,12 @@ if uploaded_file is not None:
                     sentiment_df = df_filtered.nlargest(10, '感情スコア')[['テキスト_処理済み', '感情スコア']]
                     
                     if not sentiment_df.empty:
-                        fig = px.bar(
+                        fig = go.Figure(go.Bar(
                             x=sentiment_df['感情スコア'],
                             y=sentiment_df['テキスト_処理済み'].str[:30] + "...",
-                            orientation='h',
-                            title="感情スコア上位10件"
-                        )
-                        fig.update_layout(height=400)
+                            orientation='h'
+                        ))
+                        fig.update_layout(title="感情スコア上位10件", height=400)
                         st.plotly_chart(fig, use_container_width=True)
                     else:
                         st.info("感情スコアのデータがありません")
@@ -257,44 +384,28 @@ if uploaded_file is not None:
             with tab3:
                 st.header("☁️ ワードクラウド")
                 
-                # 全テキストを結合
-                all_text = ' '.join(df_filtered['テキスト_処理済み'].dropna())
+                if len(corpus_sample) < len(df_filtered):
+                    st.caption(f"表示のため{SAMPLE_CAP:,}件をサンプリングしています")
                 
-                if all_text.strip():
-                    # 日本語の分かち書き
-                    words = jieba.cut(all_text)
-                    word_text = ' '.join(words)
-                    
+                # 分かち書き済みの単語を集計
+                word_counts = count_words(corpus_sample['トークン'])
+                
+                if word_counts:
                     # 日本語フォントの設定
                     font_path = get_japanese_font_path()
                     
-                    # ワードクラウドの生成
-                    wordcloud = WordCloud(
-                        width=800,
-                        height=400,
-                        background_color='white',
-                        max_words=100,
-                        colormap='viridis',
-                        font_path=font_path if font_path else None
-                    ).generate(word_text)
-                    
-                    # 表示
-                    fig, ax = plt.subplots(figsize=(10, 6))
-                    ax.imshow(wordcloud, interpolation='bilinear')
-                    ax.axis('off')
-                    st.pyplot(fig)
+                    # ワードクラウドの生成と表示（単語頻度ごとにキャッシュ）
+                    st.image(build_wordcloud(dict(word_counts), font_path))
                     
                     # 単語頻度の棒グラフ
-                    word_counts = Counter(word_text.split())
                     top_words = dict(word_counts.most_common(20))
                     
-                    fig = px.bar(
+                    fig = go.Figure(go.Bar(
                         x=list(top_words.values()),
                         y=list(top_words.keys()),
-                        orientation='h',
-                        title="単語出現頻度トップ20"
-                    )
-                    fig.update_layout(height=400)
+                        orientation='h'
+                    ))
+                    fig.update_layout(title="単語出現頻度トップ20", height=400)
                     st.plotly_chart(fig, use_container_width=True)
                 else:
                     st.info("テキストデータがありません")
@@ -302,20 +413,15 @@ if uploaded_file is not None:
             with tab4:
                 st.header("🗺️ 単語マップ（共起ネットワーク）")
                 
+                if len(corpus_sample) < len(df_filtered):
+                    st.caption(f"表示のため{SAMPLE_CAP:,}件をサンプリングしています")
+                
                 # 共起ネットワークの作成
                 if len(df_filtered) > 0:
                     # 単語の共起を計算
-                    word_pairs = []
-                    for text in df_filtered['テキスト_処理済み'].dropna():
-                        words = jieba.cut(text)
-                        words = [w for w in words if len(w) > 1]  # 1文字の単語を除外
-                        for i in range(len(words)):
-                            for j in range(i+1, min(i+3, len(words))):  # 隣接する単語のみ
-                                word_pairs.append(tuple(sorted([words[i], words[j]])))
+                    top_pairs = count_cooccurrences(corpus_sample['トークン'], top_n=20)
                     
-                    if word_pairs:
-                        pair_counts = Counter(word_pairs)
-                        top_pairs = pair_counts.most_common(20)
+                    if top_pairs:
                         
                         # ネットワークグラフの作成
                         G = nx.Graph()
@@ -325,27 +431,46 @@ if uploaded_file is not None:
                         # ノードの位置を計算
                         pos = nx.spring_layout(G, k=1, iterations=50)
                         
-                        # プロット
-                        fig, ax = plt.subplots(figsize=(12, 8))
-                        # 日本語フォントの設定
-                        font_path = get_japanese_font_path()
-                        if font_path:
-                            font_prop = fm.FontProperties(fname=font_path)
-                        else:
-                            font_prop = fm.FontProperties()
+                        # エッジはNoneで区切った1本の線として描画
+                        edge_x, edge_y = [], []
+                        for u, v in G.edges():
+                            x0, y0 = pos[u]
+                            x1, y1 = pos[v]
+                            edge_x.extend([x0, x1, None])
+                            edge_y.extend([y0, y1, None])
                         
-                        nx.draw(
-                            G, pos,
-                            with_labels=True,
-                            node_color='lightblue',
-                            node_size=[G.degree(node) * 100 for node in G.nodes()],
-                            font_size=8,
-                            font_family=font_prop.get_name(),
-                            edge_color='gray',
-                            width=[G[u][v]['weight'] / 2 for u, v in G.edges()]
+                        nodes = list(G.nodes())
+                        node_x = [pos[node][0] for node in nodes]
+                        node_y = [pos[node][1] for node in nodes]
+                        degrees = np.array([G.degree(node) for node in nodes])
+                        
+                        fig = go.Figure([
+                            go.Scattergl(
+                                x=edge_x,
+                                y=edge_y,
+                                mode='lines',
+                                line=dict(color='gray', width=1),
+                                hoverinfo='skip'
+                            ),
+                            go.Scattergl(
+                                x=node_x,
+                                y=node_y,
+                                mode='markers+text',
+                                text=nodes,
+                                textposition='top center',
+                                marker=dict(color='lightblue', size=10 + degrees * 4, line=dict(color='gray', width=1)),
+                                hovertemplate='%{text}<extra></extra>'
+                            )
+                        ])
+                        fig.update_layout(
+                            title="単語共起ネットワーク",
+                            height=600,
+                            showlegend=False,
+                            font=dict(family=get_font_family()),
+                            xaxis=dict(visible=False),
+                            yaxis=dict(visible=False)
                         )
-                        plt.title("単語共起ネットワーク", fontsize=14)
-                        st.pyplot(fig)
+                        st.plotly_chart(fig, use_container_width=True)
                         
                         # 共起頻度の表
                         st.subheader("共起頻度上位20件")
@@ -364,43 +489,49 @@ if uploaded_file is not None:
                 
                 if '投稿日時' in df_filtered.columns and not df_filtered['投稿日時'].isna().all():
                     # 日付別投稿数
-                    daily_posts = df_filtered.groupby(df_filtered['投稿日時'].dt.date).size().reset_index()
+                    daily_posts = df_filtered.resample('D', on='投稿日時').size().reset_index()
                     daily_posts.columns = ['日付', '投稿数']
                     
-                    fig = px.line(
-                        daily_posts,
-                        x='日付',
-                        y='投稿数',
-                        title="日別投稿数推移"
+                    fig = FigureResampler(
+                        go.Figure(go.Scattergl(
+                            x=daily_posts['日付'].to_numpy(),
+                            y=daily_posts['投稿数'].to_numpy(),
+                            mode='lines',
+                            name='投稿数'
+                        )),
+                        default_n_shown_samples=TIMESERIES_MAX_POINTS,
+                        show_mean_aggregation_size=False
                     )
-                    fig.update_layout(height=400)
+                    fig.update_layout(title="日別投稿数推移", xaxis_title='日付', yaxis_title='投稿数', height=400)
                     st.plotly_chart(fig, use_container_width=True)
                     
                     # 時間別投稿数
-                    hourly_posts = df_filtered.groupby(df_filtered['投稿日時'].dt.hour).size().reset_index()
+                    hourly_posts = df_filtered['投稿日時'].dropna().dt.hour.value_counts().sort_index().reset_index()
                     hourly_posts.columns = ['時間', '投稿数']
                     
-                    fig = px.bar(
-                        hourly_posts,
-                        x='時間',
-                        y='投稿数',
-                        title="時間別投稿数分布"
-                    )
-                    fig.update_layout(height=400)
+                    fig = go.Figure(go.Bar(
+                        x=hourly_posts['時間'].to_numpy(),
+                        y=hourly_posts['投稿数'].to_numpy()
+                    ))
+                    fig.update_layout(title="時間別投稿数分布", xaxis_title='時間', yaxis_title='投稿数', height=400)
                     st.plotly_chart(fig, use_container_width=True)
                     
                     # 感情スコアの時系列推移
                     if '感情スコア' in df_filtered.columns:
-                        sentiment_time = df_filtered.groupby(df_filtered['投稿日時'].dt.date)['感情スコア'].mean().reset_index()
+                        sentiment_time = df_filtered.resample('D', on='投稿日時')['感情スコア'].mean().dropna().reset_index()
                         sentiment_time.columns = ['日付', '平均感情スコア']
                         
-                        fig = px.line(
-                            sentiment_time,
-                            x='日付',
-                            y='平均感情スコア',
-                            title="日別平均感情スコア推移"
+                        fig = FigureResampler(
+                            go.Figure(go.Scattergl(
+                                x=sentiment_time['日付'].to_numpy(),
+                                y=sentiment_time['平均感情スコア'].to_numpy(),
+                                mode='lines',
+                                name='平均感情スコア'
+                            )),
+                            default_n_shown_samples=TIMESERIES_MAX_POINTS,
+                            show_mean_aggregation_size=False
                         )
-                        fig.update_layout(height=400)
+                        fig.update_layout(title="日別平均感情スコア推移", xaxis_title='日付', yaxis_title='平均感情スコア', height=400)
                         st.plotly_chart(fig, use_container_width=True)
                 else:
                     st.info("投稿日時のデータが不足しています")
@@ -1,7 +1,9 @@
 import platform
 import os
 from pathlib import Path
+from functools import lru_cache
 
+@lru_cache(maxsize=1)
 def get_japanese_font_path():
     """
     システムに応じた日本語フォントのパスを取得
@@ -51,6 +53,7 @@ def get_japanese_font_path():
     # デフォルトフォント（日本語非対応の可能性あり）
     return None
 
+@lru_cache(maxsize=1)
 def get_font_family():
     """
     システムに応じたフォントファミリーを取得
@@ -1,4 +1,5 @@
 import emoji
+import pandas as pd
 
 # 利用可能な関数を確認
 print("利用可能な関数:")
@@ -35,3 +36,11 @@ try:
     print(f"get_emoji_regexp: {result4}")
 except AttributeError as e:
     print(f"get_emoji_regexp エラー: {e}")
+
+# app.pyと同じ列単位の絵文字除去（Series.mapでreplace_emoji）で、絵文字が丸ごと消えるか
+samples = pd.Series([test_text] + [f"前{e}後" for e in emoji.EMOJI_DATA], dtype='string[pyarrow]')
+removed = samples.map(lambda t: emoji.replace_emoji(t, replace=''))
+print(f"Series.map: {removed.iloc[0]}")
+
+leftovers = sum(r != "前後" for r in removed.iloc[1:])
+print(f"絵文字の一部が残った件数: {leftovers}件")